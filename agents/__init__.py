@@ -1,6 +1,27 @@
-from .base_agent import BaseAgent, Message
-from .collector_agent import DataCollectorAgent
-from .processor_agent import DataProcessorAgent
-from .classifier_agent import QualityClassifierAgent
-from .advisor_agent import HealthAdvisorAgent
-from .coordinator_agent import CoordinatorAgent
\ No newline at end of file
+"""
+Agents of the Multi-Agent System.
+
+Agent classes are imported on first access, so importing one agent module
+does not load every agent (and pandas) along with it.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "BaseAgent": "base_agent",
+    "Message": "base_agent",
+    "DataCollectorAgent": "collector_agent",
+    "DataProcessorAgent": "processor_agent",
+    "QualityClassifierAgent": "classifier_agent",
+    "HealthAdvisorAgent": "advisor_agent",
+    "CoordinatorAgent": "coordinator_agent",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{module_name}", __name__), name)
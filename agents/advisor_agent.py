@@ -7,25 +7,102 @@ It's the FOURTH agent in our pipeline.
 Job: Receive classified data → Add health advice → Pass to next agent
 """
 
-import sys
-import os
+from types import MappingProxyType
 
-# Add project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
-
-import pandas as pd
+import numpy as np
 from agents.base_agent import BaseAgent
 from config.aqi_standards import HEALTH_RECOMMENDATIONS
 
 
+# Lookup tables are built once at import and frozen so they can be shared
+
+# Emoji representing recommended activity level for each category
+_EMOJI_MAP = MappingProxyType({
+    "very_good": "🏃‍♂️",  # Running - all outdoor activities OK
+    "good": "🏃‍♂️",       # Running - all outdoor activities OK
+    "moderate": "🚶",      # Walking - light activities
+    "sufficient": "🏠",    # House - stay inside preferred
+    "bad": "⚠️",          # Warning - avoid outdoors
+    "very_bad": "🚫",      # No entry - stay indoors
+})
+
+# Category name → key, for both English and Polish names
+_NAME_TO_KEY = MappingProxyType({
+    # English names
+    "Very Good": "very_good",
+    "Good": "good",
+    "Moderate": "moderate",
+    "Sufficient": "sufficient",
+    "Bad": "bad",
+    "Very Bad": "very_bad",
+    # Polish names (from GIOŚ API)
+    "Bardzo dobry": "very_good",
+    "Dobry": "good",
+    "Umiarkowany": "moderate",
+    "Dostateczny": "sufficient",
+    "Zły": "bad",
+    "Bardzo zły": "very_bad",
+})
+
+# Category key → advice text
+_GENERAL_ADVICE = MappingProxyType(
+    {k: v["general_en"] for k, v in HEALTH_RECOMMENDATIONS.items()}
+)
+_SENSITIVE_ADVICE = MappingProxyType(
+    {k: v["sensitive_en"] for k, v in HEALTH_RECOMMENDATIONS.items()}
+)
+
+# The same tables as arrays indexed by category code (in _ADVICE_KEYS order).
+# The extra last entry, picked by code -1, is the "moderate" fallback that
+# category_name_to_key uses for unknown categories.
+_ADVICE_KEYS = tuple(HEALTH_RECOMMENDATIONS)
+
+
+def _lookup_array(table, fallback):
+    values = [table.get(key, fallback) for key in _ADVICE_KEYS]
+    values.append(table.get("moderate", fallback))
+    return np.array(values, dtype=object)
+
+
+_GENERAL_ADVICE_ARRAY = _lookup_array(_GENERAL_ADVICE, "No data available")
+_SENSITIVE_ADVICE_ARRAY = _lookup_array(_SENSITIVE_ADVICE, "No data available")
+_EMOJI_ARRAY = _lookup_array(_EMOJI_MAP, "❓")
+
+# Text report layout: header, one block per city, footer
+_REPORT_HEADER = "=" * 50 + "\nAIR QUALITY REPORT\n" + "=" * 50 + "\n\n"
+_REPORT_ROW = (
+    "📍 {city}\n"
+    "   Status: {overall_category} {emoji}\n"
+    "   Main concern: {dominant_pollutant} ({dominant_value:.1f} µg/m³)\n"
+    "   💡 {health_advice}\n"
+    "\n"
+)
+_REPORT_FOOTER = "=" * 50
+
+# City summary columns that hold few distinct strings
+_CATEGORY_COLUMNS = (
+    'city',
+    'overall_category',
+    'overall_color',
+    'dominant_pollutant',
+    'health_advice',
+    'sensitive_advice',
+    'emoji',
+)
+
+
 class HealthAdvisorAgent(BaseAgent):
     """
     Agent responsible for generating health recommendations.
     """
     
-    def __init__(self):
-        super().__init__()
+    EMOJI_MAP = _EMOJI_MAP
+    NAME_TO_KEY = _NAME_TO_KEY
+    GENERAL_ADVICE = _GENERAL_ADVICE
+    SENSITIVE_ADVICE = _SENSITIVE_ADVICE
+    
+    def __init__(self, quiet=False):
+        super().__init__(quiet=quiet)
     
     def get_name(self):
         return "HealthAdvisorAgent"
@@ -40,11 +117,9 @@ class HealthAdvisorAgent(BaseAgent):
         Returns:
             Dictionary with 'general' and 'sensitive' advice
         """
-        recommendations = HEALTH_RECOMMENDATIONS.get(category_key, {})
-        
         return {
-            "general": recommendations.get("general_en", "No data available"),
-            "sensitive": recommendations.get("sensitive_en", "No data available"),
+            "general": self.GENERAL_ADVICE.get(category_key, "No data available"),
+            "sensitive": self.SENSITIVE_ADVICE.get(category_key, "No data available"),
         }
     
     def get_activity_emoji(self, category_key):
@@ -57,15 +132,7 @@ class HealthAdvisorAgent(BaseAgent):
         Returns:
             Emoji string
         """
-        emoji_map = {
-            "very_good": "🏃‍♂️",  # Running - all outdoor activities OK
-            "good": "🏃‍♂️",       # Running - all outdoor activities OK
-            "moderate": "🚶",      # Walking - light activities
-            "sufficient": "🏠",    # House - stay inside preferred
-            "bad": "⚠️",          # Warning - avoid outdoors
-            "very_bad": "🚫",      # No entry - stay indoors
-        }
-        return emoji_map.get(category_key, "❓")
+        return self.EMOJI_MAP.get(category_key, "❓")
     
     def category_name_to_key(self, category_name):
         """
@@ -78,56 +145,46 @@ class HealthAdvisorAgent(BaseAgent):
         Returns:
             Category key: e.g., "very_good", "moderate"
         """
-        mapping = {
-            # English names
-            "Very Good": "very_good",
-            "Good": "good",
-            "Moderate": "moderate",
-            "Sufficient": "sufficient",
-            "Bad": "bad",
-            "Very Bad": "very_bad",
-            # Polish names (from GIOŚ API)
-            "Bardzo dobry": "very_good",
-            "Dobry": "good",
-            "Umiarkowany": "moderate",
-            "Dostateczny": "sufficient",
-            "Zły": "bad",
-            "Bardzo zły": "very_bad",
-        }
-        return mapping.get(category_name, "moderate")
+        return self.NAME_TO_KEY.get(category_name, "moderate")
     
     def add_recommendations(self, city_summary):
         """
         Add health recommendations to city summary DataFrame.
         
+        The columns are added to `city_summary` in place - no copy is made.
+        
         Args:
             city_summary: DataFrame with city AQI info
             
         Returns:
             DataFrame with added recommendation columns
         """
+        import pandas as pd
+        from utils.categoricals import as_category_columns
+        
         if city_summary.empty:
             return city_summary
         
-        df = city_summary.copy()
-        
-        # Add recommendations for each city
-        general_advice = []
-        sensitive_advice = []
-        emojis = []
+        df = city_summary
         
-        for _, row in df.iterrows():
-            category_name = row['overall_category']
-            category_key = self.category_name_to_key(category_name)
+        if 'overall_category_key' in df:
+            # Common path: the classifier passed category keys along, so
+            # index the lookup arrays with their integer codes directly
+            codes = pd.Categorical(df['overall_category_key'], categories=_ADVICE_KEYS).codes
+            
+            df['health_advice'] = _GENERAL_ADVICE_ARRAY[codes]
+            df['sensitive_advice'] = _SENSITIVE_ADVICE_ARRAY[codes]
+            df['emoji'] = _EMOJI_ARRAY[codes]
+        else:
+            # Map whole columns at once instead of looping over rows
+            # (as plain objects - fillna can't add new values to a categorical)
+            keys = df['overall_category'].astype(object).map(self.NAME_TO_KEY).fillna("moderate")
             
-            rec = self.get_recommendation(category_key)
-            general_advice.append(rec['general'])
-            sensitive_advice.append(rec['sensitive'])
-            emojis.append(self.get_activity_emoji(category_key))
+            df['health_advice'] = keys.map(self.GENERAL_ADVICE).fillna("No data available")
+            df['sensitive_advice'] = keys.map(self.SENSITIVE_ADVICE).fillna("No data available")
+            df['emoji'] = keys.map(self.EMOJI_MAP).fillna("❓")
         
-        df['health_advice'] = general_advice
-        df['sensitive_advice'] = sensitive_advice
-        df['emoji'] = emojis
+        as_category_columns(df, _CATEGORY_COLUMNS)
         
         return df
     
@@ -141,22 +198,12 @@ class HealthAdvisorAgent(BaseAgent):
         Returns:
             Formatted string report
         """
-        lines = []
-        lines.append("=" * 50)
-        lines.append("AIR QUALITY REPORT")
-        lines.append("=" * 50)
-        lines.append("")
+        body = "".join(
+            _REPORT_ROW.format(**row._asdict())
+            for row in city_summary.itertuples(index=False)
+        )
         
-        for _, row in city_summary.iterrows():
-            lines.append(f"📍 {row['city']}")
-            lines.append(f"   Status: {row['overall_category']} {row['emoji']}")
-            lines.append(f"   Main concern: {row['dominant_pollutant']} ({row['dominant_value']:.1f} µg/m³)")
-            lines.append(f"   💡 {row['health_advice']}")
-            lines.append("")
-        
-        lines.append("=" * 50)
-        
-        return "\n".join(lines)
+        return _REPORT_HEADER + body + _REPORT_FOOTER
     
     def process(self, input_message=None):
         """
@@ -168,6 +215,8 @@ class HealthAdvisorAgent(BaseAgent):
         Returns:
             Message containing data with health recommendations
         """
+        import pandas as pd
+        
         # Check input
         if input_message is None:
             self.log("ERROR: No input message received")
@@ -196,7 +245,6 @@ class HealthAdvisorAgent(BaseAgent):
             "measurements": classified_data.get("measurements", pd.DataFrame()),
             "city_summary": city_with_advice,
             "report": report,
-            "raw_data": classified_data.get("raw_data", {}),
         }
         
         return self.create_message(data=final_data, status="success")
@@ -208,9 +256,9 @@ if __name__ == "__main__":
     print("=" * 50)
     
     # Get data from previous agents
-    from collector_agent import DataCollectorAgent
-    from processor_agent import DataProcessorAgent
-    from classifier_agent import QualityClassifierAgent
+    from agents.collector_agent import DataCollectorAgent
+    from agents.processor_agent import DataProcessorAgent
+    from agents.classifier_agent import QualityClassifierAgent
     
     collector = DataCollectorAgent()
     raw_message = collector.run()
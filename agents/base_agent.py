@@ -5,13 +5,7 @@ This is the parent class for all agents in the Multi-Agent System.
 It provides common functionality like logging and message passing.
 """
 
-import sys
-import os
-
-# Add project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
-
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
 
@@ -26,6 +20,9 @@ class Message:
     - status: success or error
     """
     
+    # Fixed attributes - no per-instance __dict__
+    __slots__ = ("sender", "data", "status", "timestamp")
+    
     def __init__(self, sender, data, status="success"):
         self.sender = sender
         self.data = data
@@ -45,8 +42,15 @@ class BaseAgent(ABC):
     - process(): Main processing logic
     """
     
-    def __init__(self):
+    def __init__(self, quiet=False):
+        """
+        Initialize the agent.
+        
+        Args:
+            quiet: If True, log() prints nothing
+        """
         self.name = self.get_name()
+        self.quiet = quiet
     
     @abstractmethod
     def get_name(self):
@@ -81,7 +85,10 @@ class BaseAgent(ABC):
     
     def log(self, message):
         """Print a log message with agent name and timestamp."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        if self.quiet:
+            return
+        
+        timestamp = time.strftime("%H:%M:%S")
         print(f"[{timestamp}] {self.name}: {message}")
     
     def run(self, input_message=None):
@@ -91,11 +98,11 @@ class BaseAgent(ABC):
         This is the main entry point for running an agent.
         """
         self.log("Starting...")
-        start_time = datetime.now()
+        start_ns = time.monotonic_ns()
         
         try:
             result = self.process(input_message)
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = (time.monotonic_ns() - start_ns) / 1e9
             self.log(f"Completed in {duration:.2f} seconds")
             return result
         except Exception as e:
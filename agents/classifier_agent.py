@@ -7,16 +7,61 @@ It's the THIRD agent in our pipeline.
 Job: Receive clean data → Apply AQI thresholds → Add categories → Pass to next agent
 """
 
-import sys
-import os
+import numpy as np
+from agents.base_agent import BaseAgent
+from config.aqi_standards import (
+    AQI_CATEGORIES,
+    CATEGORY_NAMES,
+    THRESHOLD_EDGES,
+    THRESHOLD_LOWER,
+    categorize,
+)
+from config.settings import NUMBA_MIN_ROWS
+from utils.classify_numba import NUMBA_AVAILABLE, classify_codes
 
-# Add project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
 
-import pandas as pd
-from agents.base_agent import BaseAgent
-from config.aqi_standards import AQI_CATEGORIES, AQI_THRESHOLDS
+# Bin edges for each parameter: the lowest valid value followed by the
+# upper bound of each category in CATEGORY_NAMES order
+_BINS = {
+    param: [THRESHOLD_LOWER[param], *edges.tolist()]
+    for param, edges in THRESHOLD_EDGES.items()
+}
+_LABEL_KEYS = CATEGORY_NAMES.tolist()
+
+# Category key → display values (plus the fallback for unknown parameters)
+_KEY_TO_NAME = {k: v["name_en"] for k, v in AQI_CATEGORIES.items()}
+_KEY_TO_LEVEL = {k: v["level"] for k, v in AQI_CATEGORIES.items()}
+_KEY_TO_COLOR = {k: v["color"] for k, v in AQI_CATEGORIES.items()}
+_KEY_TO_NAME["unknown"] = "Unknown"
+_KEY_TO_LEVEL["unknown"] = -1
+_KEY_TO_COLOR["unknown"] = "#808080"
+
+# Full classify_value result for each category key
+_CLASSIFICATIONS = {
+    key: (key, _KEY_TO_NAME[key], _KEY_TO_LEVEL[key], _KEY_TO_COLOR[key])
+    for key in _KEY_TO_NAME
+}
+
+# Most readings fall in the two lowest categories, so classify_value checks
+# those first: (lower bound, first upper, second upper, first key, second key)
+_FAST_PATH = {
+    param: (bins[0], bins[1], bins[2], _LABEL_KEYS[0], _LABEL_KEYS[1])
+    for param, bins in _BINS.items()
+}
+
+# Dense tables for the Numba kernel: one row of edges per parameter
+# (padded with inf) and the category id of each bin
+_KEY_ORDER = list(_KEY_TO_NAME)
+_KEY_ORDER_ARRAY = np.asarray(_KEY_ORDER, dtype=object)
+_PARAM_ROW = {param: row for row, param in enumerate(_BINS)}
+_EDGE_TABLE = np.full((len(_BINS), max(map(len, _BINS.values()))), np.inf)
+_KEY_ID_TABLE = np.zeros((len(_BINS), _EDGE_TABLE.shape[1] - 1), dtype=np.int64)
+for _param, _row in _PARAM_ROW.items():
+    _EDGE_TABLE[_row, :len(_BINS[_param])] = _BINS[_param]
+    _KEY_ID_TABLE[_row, :len(_LABEL_KEYS)] = [_KEY_ORDER.index(key) for key in _LABEL_KEYS]
+
+# Columns of the classified measurements that hold few distinct strings
+_CATEGORY_COLUMNS = ('city', 'parameter_code', 'aqi_category_key', 'aqi_category', 'aqi_color')
 
 
 class QualityClassifierAgent(BaseAgent):
@@ -24,8 +69,8 @@ class QualityClassifierAgent(BaseAgent):
     Agent responsible for classifying air quality measurements.
     """
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, quiet=False):
+        super().__init__(quiet=quiet)
     
     def get_name(self):
         return "QualityClassifierAgent"
@@ -41,52 +86,115 @@ class QualityClassifierAgent(BaseAgent):
         Returns:
             Tuple of (category_key, category_name, level, color)
         """
-        # Get thresholds for this parameter
-        thresholds = AQI_THRESHOLDS.get(parameter)
-        
-        if thresholds is None:
-            return ("unknown", "Unknown", -1, "#808080")
-        
-        # Find which category this value falls into
-        for category_key, (min_val, max_val) in thresholds.items():
-            if min_val <= value <= max_val:
-                category_info = AQI_CATEGORIES.get(category_key, {})
-                return (
-                    category_key,
-                    category_info.get("name_en", category_key),
-                    category_info.get("level", -1),
-                    category_info.get("color", "#808080")
-                )
-        
-        # If value exceeds all thresholds, it's very bad
-        return ("very_bad", "Very Bad", 5, "#990000")
+        fast_path = _FAST_PATH.get(parameter)
+        
+        if fast_path is None:
+            return _CLASSIFICATIONS["unknown"]
+        
+        # If value is outside all thresholds (or not a number), it's very bad
+        lower, first_max, second_max, first_key, second_key = fast_path
+        if not lower <= value:
+            return _CLASSIFICATIONS["very_bad"]
+        
+        # Fast path for the common lowest categories
+        if value <= first_max:
+            return _CLASSIFICATIONS[first_key]
+        if value <= second_max:
+            return _CLASSIFICATIONS[second_key]
+        
+        # Binary search for the category this value falls into
+        idx = int(np.searchsorted(THRESHOLD_EDGES[parameter], value, side='left'))
+        return _CLASSIFICATIONS[_LABEL_KEYS[idx]]
+    
+    def _category_keys_numpy(self, df):
+        """
+        Find the category key of every measurement, one categorize call per parameter.
+        
+        Args:
+            df: DataFrame with measurements
+            
+        Returns:
+            Series of category keys aligned with `df`
+        """
+        import pandas as pd
+        
+        category_keys = pd.Series("unknown", index=df.index, dtype=object)
+        
+        for param, group in df.groupby('parameter_code', observed=True):
+            if param not in THRESHOLD_EDGES:
+                continue
+            
+            category_keys.loc[group.index] = categorize(param, group['value'].to_numpy())
+        
+        return category_keys
+    
+    def _category_keys_numba(self, df):
+        """
+        Find the category key of every measurement with the compiled Numba kernel.
+        
+        Args:
+            df: DataFrame with measurements
+            
+        Returns:
+            Array of category keys aligned with `df`
+        """
+        import pandas as pd
+        
+        params = pd.Categorical(df['parameter_code'])
+        
+        # Table row for each category code; the extra -1 at the end is what
+        # missing parameters (code -1) pick up
+        rows = np.array(
+            [_PARAM_ROW.get(param, -1) for param in params.categories] + [-1],
+            dtype=np.int64,
+        )
+        
+        key_ids = classify_codes(
+            df['value'].to_numpy(dtype=np.float64),
+            rows[params.codes],
+            _EDGE_TABLE,
+            _KEY_ID_TABLE,
+            unknown_id=_KEY_ORDER.index("unknown"),
+            out_of_range_id=_KEY_ORDER.index("very_bad"),
+        )
+        
+        return _KEY_ORDER_ARRAY[key_ids]
     
     def classify_measurements(self, df):
         """
         Add classification columns to the measurements DataFrame.
         
+        The columns are added to `df` in place - no copy is made, since
+        the DataFrame is owned by the pipeline.
+        
         Args:
             df: DataFrame with measurements
             
         Returns:
             DataFrame with added columns: aqi_category, aqi_level, aqi_color
         """
+        import pandas as pd
+        from utils.categoricals import as_category_columns
+        
         if df.empty:
             return df
         
-        df_classified = df.copy()
+        df_classified = df
         
-        # Classify each row
-        classifications = df_classified.apply(
-            lambda row: self.classify_value(row['parameter_code'], row['value']),
-            axis=1
-        )
+        # Bin values in bulk instead of row by row
+        if NUMBA_AVAILABLE and len(df_classified) >= NUMBA_MIN_ROWS:
+            category_keys = pd.Series(self._category_keys_numba(df_classified), index=df.index)
+        else:
+            category_keys = self._category_keys_numpy(df_classified)
+        
+        # Add new columns. The key column uses a fixed category order, so its
+        # integer codes mean the same thing in every batch and downstream agent.
+        df_classified['aqi_category_key'] = pd.Categorical(category_keys, categories=_KEY_ORDER)
+        df_classified['aqi_category'] = category_keys.map(_KEY_TO_NAME)
+        df_classified['aqi_level'] = category_keys.map(_KEY_TO_LEVEL)
+        df_classified['aqi_color'] = category_keys.map(_KEY_TO_COLOR)
         
-        # Add new columns
-        df_classified['aqi_category_key'] = classifications.apply(lambda x: x[0])
-        df_classified['aqi_category'] = classifications.apply(lambda x: x[1])
-        df_classified['aqi_level'] = classifications.apply(lambda x: x[2])
-        df_classified['aqi_color'] = classifications.apply(lambda x: x[3])
+        as_category_columns(df_classified, _CATEGORY_COLUMNS)
         
         return df_classified
     
@@ -102,30 +210,38 @@ class QualityClassifierAgent(BaseAgent):
         Returns:
             DataFrame with one row per city
         """
+        import pandas as pd
+        
         if df.empty:
             return pd.DataFrame()
         
-        # For each city, find the worst (highest level) measurement
-        city_summary = []
+        by_city = df.groupby('city', sort=False, observed=True)
         
-        for city in df['city'].unique():
-            city_data = df[df['city'] == city]
-            
-            # Find the row with highest aqi_level (worst air quality)
-            worst_idx = city_data['aqi_level'].idxmax()
-            worst_row = city_data.loc[worst_idx]
-            
-            city_summary.append({
-                'city': city,
-                'overall_category': worst_row['aqi_category'],
-                'overall_level': worst_row['aqi_level'],
-                'overall_color': worst_row['aqi_color'],
-                'dominant_pollutant': worst_row['parameter_code'],
-                'dominant_value': worst_row['value'],
-                'stations_count': city_data['station_id'].nunique(),
-            })
-        
-        return pd.DataFrame(city_summary)
+        # For each city, find the row with highest aqi_level (worst air quality)
+        worst_idx = by_city['aqi_level'].idxmax()
+        
+        city_summary = df.loc[worst_idx].rename(columns={
+            'aqi_category_key': 'overall_category_key',
+            'aqi_category': 'overall_category',
+            'aqi_level': 'overall_level',
+            'aqi_color': 'overall_color',
+            'parameter_code': 'dominant_pollutant',
+            'value': 'dominant_value',
+        })
+        city_summary['stations_count'] = (
+            by_city['station_id'].nunique().reindex(city_summary['city']).values
+        )
+        
+        return city_summary.reset_index(drop=True)[[
+            'city',
+            'overall_category',
+            'overall_level',
+            'overall_color',
+            'dominant_pollutant',
+            'dominant_value',
+            'stations_count',
+            'overall_category_key',
+        ]]
     
     def process(self, input_message=None):
         """
@@ -137,6 +253,8 @@ class QualityClassifierAgent(BaseAgent):
         Returns:
             Message containing classified data
         """
+        import pandas as pd
+        
         # Check input
         if input_message is None:
             self.log("ERROR: No input message received")
@@ -161,15 +279,14 @@ class QualityClassifierAgent(BaseAgent):
         city_summary = self.get_city_summary(classified_df)
         
         # Log results
-        for _, row in city_summary.iterrows():
-            self.log(f"  {row['city']}: {row['overall_category']} (worst: {row['dominant_pollutant']})")
+        for row in city_summary.itertuples(index=False):
+            self.log(f"  {row.city}: {row.overall_category} (worst: {row.dominant_pollutant})")
         
         # Package results
         classified_data = {
             "measurements": classified_df,
             "city_summary": city_summary,
             "aqi": processed_data.get("aqi", pd.DataFrame()),
-            "raw_data": processed_data.get("raw_data", {}),
         }
         
         return self.create_message(data=classified_data, status="success")
@@ -181,8 +298,8 @@ if __name__ == "__main__":
     print("=" * 50)
     
     # Get data from previous agents
-    from collector_agent import DataCollectorAgent
-    from processor_agent import DataProcessorAgent
+    from agents.collector_agent import DataCollectorAgent
+    from agents.processor_agent import DataProcessorAgent
     
     collector = DataCollectorAgent()
     raw_message = collector.run()
@@ -7,15 +7,10 @@ It's the FIRST agent in our pipeline.
 Job: Call the API → Get raw data → Pass to next agent
 """
 
-import sys
-import os
-
-# Add project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
+from concurrent.futures import ThreadPoolExecutor
 
 from agents.base_agent import BaseAgent
-from config.settings import TARGET_CITIES, USE_MOCK_DATA
+from config.settings import TARGET_CITIES, USE_MOCK_DATA, MAX_WORKERS
 
 # Choose API client based on settings
 if USE_MOCK_DATA:
@@ -29,16 +24,19 @@ class DataCollectorAgent(BaseAgent):
     Agent responsible for collecting air quality data from GIOŚ API.
     """
     
-    def __init__(self, target_cities=None):
+    def __init__(self, target_cities=None, force_refresh=False, quiet=False):
         """
         Initialize the agent.
         
         Args:
             target_cities: List of cities to monitor (default: from settings)
+            force_refresh: If True, bypass cached API responses
+            quiet: If True, log() prints nothing
         """
         self.target_cities = target_cities or TARGET_CITIES
-        self.api_client = ApiClient()  # Using mock data for now
-        super().__init__()
+        self.target_city_set = frozenset(self.target_cities)
+        self.api_client = ApiClient(force_refresh=force_refresh)
+        super().__init__(quiet=quiet)
     
     def get_name(self):
         return "DataCollectorAgent"
@@ -55,16 +53,119 @@ class DataCollectorAgent(BaseAgent):
         # Get all stations from API
         all_stations = self.api_client.get_all_stations()
         
-        # Filter only stations in our target cities
-        filtered = []
-        for station in all_stations:
-            city_name = station.get("city", {}).get("name", "")
-            if city_name in self.target_cities:
-                filtered.append(station)
+        # Filter only stations in our target cities (set lookup per station).
+        # Every station normally has a city name, so index directly and only
+        # fall back to .get if a record is missing one.
+        target_cities = self.target_city_set
+        try:
+            filtered = [
+                station for station in all_stations
+                if station["city"]["name"] in target_cities
+            ]
+        except KeyError:
+            filtered = [
+                station for station in all_stations
+                if station.get("city", {}).get("name") in target_cities
+            ]
         
         self.log(f"Found {len(filtered)} stations")
         return filtered
     
+    def _fetch_station(self, station, sensors):
+        """
+        Fetch measurements and AQI for one station.
+        
+        Args:
+            station: Station dictionary from the API
+            sensors: List of the station's sensors
+            
+        Returns:
+            Tuple of (city_name, station_entry)
+        """
+        city_name = station.get("city", {}).get("name", "Unknown")
+        station_id = station["id"]
+        
+        # Get measurements for all sensors at once (the client fans them out)
+        sensor_ids = [sensor["id"] for sensor in sensors]
+        all_measurements = dict(self.api_client.get_sensor_data_bulk(sensor_ids))
+        
+        sensor_data = []
+        for sensor in sensors:
+            sensor_data.append({
+                "sensor_id": sensor["id"],
+                "parameter": sensor.get("param", {}),
+                "measurements": all_measurements[sensor["id"]]
+            })
+        
+        # Get AQI for station
+        aqi_data = self.api_client.get_station_aqi(station_id)
+        
+        station_entry = {
+            "station_id": station_id,
+            "station_name": station.get("stationName", "Unknown"),
+            "latitude": station.get("gegrLat"),
+            "longitude": station.get("gegrLon"),
+            "sensors": sensor_data,
+            "aqi": aqi_data
+        }
+        
+        return city_name, station_entry
+    
+    def iter_city_data(self, collection_timestamp=None):
+        """
+        Collect data city by city, yielding each city as soon as it is complete.
+        
+        Requests for all stations are started up front, so later cities keep
+        downloading while earlier ones are being processed by the caller.
+        
+        Args:
+            collection_timestamp: ISO timestamp to stamp each batch with
+                (default: now)
+            
+        Yields:
+            Dictionary in the same shape as collect_all_data(), holding one city
+        """
+        from datetime import datetime
+        
+        if collection_timestamp is None:
+            collection_timestamp = datetime.now().isoformat()
+        
+        # Get stations and their sensor lists (fetched concurrently)
+        stations = self.get_stations_for_cities()
+        sensors_by_station = dict(
+            self.api_client.get_sensors_bulk([station["id"] for station in stations])
+        )
+        
+        # Fetch every station concurrently - the work is almost all HTTP waiting.
+        # Per-sensor requests run on the API client's own pool, so station
+        # tasks never block waiting on this one.
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as station_pool:
+            
+            # Group futures by city, keeping the original station order
+            futures_by_city = {}
+            for station in stations:
+                city_name = station.get("city", {}).get("name", "Unknown")
+                future = station_pool.submit(
+                    self._fetch_station, station, sensors_by_station[station["id"]]
+                )
+                futures_by_city.setdefault(city_name, []).append((station, future))
+            
+            for city_name, city_futures in futures_by_city.items():
+                station_entries = []
+                for station, future in city_futures:
+                    try:
+                        _, station_entry = future.result()
+                    except Exception as e:
+                        self.log(f"ERROR: Failed to fetch station {station.get('id')}: {e}")
+                        continue
+                    station_entries.append(station_entry)
+                
+                if station_entries:
+                    yield {
+                        "cities": {city_name: {"stations": station_entries}},
+                        "collection_timestamp": collection_timestamp,
+                    }
+    
     def collect_all_data(self):
         """
         Main collection method - gathers all data for target cities.
@@ -79,45 +180,8 @@ class DataCollectorAgent(BaseAgent):
             "collection_timestamp": datetime.now().isoformat(),
         }
         
-        # Get stations
-        stations = self.get_stations_for_cities()
-        
-        # Process each station
-        for station in stations:
-            city_name = station.get("city", {}).get("name", "Unknown")
-            station_id = station["id"]
-            
-            # Initialize city if first time seeing it
-            if city_name not in collected_data["cities"]:
-                collected_data["cities"][city_name] = {"stations": []}
-            
-            # Get sensors for this station
-            sensors = self.api_client.get_station_sensors(station_id)
-            
-            # Get measurements for each sensor
-            sensor_data = []
-            for sensor in sensors:
-                sensor_id = sensor["id"]
-                measurements = self.api_client.get_sensor_data(sensor_id)
-                sensor_data.append({
-                    "sensor_id": sensor_id,
-                    "parameter": sensor.get("param", {}),
-                    "measurements": measurements
-                })
-            
-            # Get AQI for station
-            aqi_data = self.api_client.get_station_aqi(station_id)
-            
-            # Add station to city
-            station_entry = {
-                "station_id": station_id,
-                "station_name": station.get("stationName", "Unknown"),
-                "latitude": station.get("gegrLat"),
-                "longitude": station.get("gegrLon"),
-                "sensors": sensor_data,
-                "aqi": aqi_data
-            }
-            collected_data["cities"][city_name]["stations"].append(station_entry)
+        for city_batch in self.iter_city_data(collected_data["collection_timestamp"]):
+            collected_data["cities"].update(city_batch["cities"])
         
         return collected_data
     
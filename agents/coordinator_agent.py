@@ -7,14 +7,11 @@ It's the CENTRAL CONTROLLER of our Multi-Agent System.
 Job: Initialize agents → Run pipeline → Handle errors → Return final results
 """
 
-import sys
-import os
-
-# Add project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
-
+import queue
+import threading
 from datetime import datetime
+
+import pandas as pd
 from agents.base_agent import BaseAgent
 from agents.collector_agent import DataCollectorAgent
 from agents.processor_agent import DataProcessorAgent
@@ -27,35 +24,97 @@ class CoordinatorAgent(BaseAgent):
     Agent responsible for coordinating all other agents.
     """
     
-    def __init__(self, target_cities=None):
+    def __init__(self, target_cities=None, force_refresh=False, quiet=False):
         """
         Initialize the coordinator and all sub-agents.
         
         Args:
             target_cities: Optional list of cities to monitor
+            force_refresh: If True, bypass cached API responses
+            quiet: If True, neither the coordinator nor its sub-agents log
         """
         self.target_cities = target_cities
         
         # Initialize all agents
-        self.collector = DataCollectorAgent(target_cities=target_cities)
-        self.processor = DataProcessorAgent()
-        self.classifier = QualityClassifierAgent()
-        self.advisor = HealthAdvisorAgent()
+        self.collector = DataCollectorAgent(
+            target_cities=target_cities, force_refresh=force_refresh, quiet=quiet
+        )
+        self.processor = DataProcessorAgent(quiet=quiet)
+        self.classifier = QualityClassifierAgent(quiet=quiet)
+        self.advisor = HealthAdvisorAgent(quiet=quiet)
         
         # Track pipeline status
         self.pipeline_status = {}
         
-        super().__init__()
+        super().__init__(quiet=quiet)
     
     def get_name(self):
         return "CoordinatorAgent"
     
+    def _collect_in_background(self, batches):
+        """
+        Run the collector and put one Message per city on the queue.
+        
+        Runs on a background thread. A None is always put last so the
+        consumer knows collection has finished.
+        
+        Args:
+            batches: queue.Queue shared with run_pipeline
+        """
+        try:
+            for city_batch in self.collector.iter_city_data():
+                batches.put(self.collector.create_message(data=city_batch))
+        except Exception as e:
+            self.collector.log(f"ERROR: {str(e)}")
+            batches.put(self.collector.create_message(data=None, status="error"))
+        finally:
+            batches.put(None)
+    
+    def _merge_batches(self, classified_batches):
+        """
+        Combine per-city classifier results into one classifier payload.
+        
+        Args:
+            classified_batches: List of data dictionaries from QualityClassifierAgent
+            
+        Returns:
+            Dictionary in the same shape as a single classifier result
+        """
+        def concat(key):
+            frames = [batch[key] for batch in classified_batches if not batch[key].empty]
+            if not frames:
+                return pd.DataFrame()
+            
+            merged = pd.concat(frames, ignore_index=True)
+            
+            # Categoricals with different categories per city concatenate as
+            # plain objects, so convert them back, keeping the categories in
+            # their original order
+            for col in frames[0].select_dtypes('category').columns:
+                if merged[col].dtype != 'category':
+                    categories = dict.fromkeys(
+                        category for frame in frames for category in frame[col].cat.categories
+                    )
+                    merged[col] = merged[col].astype(pd.CategoricalDtype(list(categories)))
+            
+            return merged
+        
+        return {
+            "measurements": concat("measurements"),
+            "city_summary": concat("city_summary"),
+            "aqi": concat("aqi"),
+        }
+    
     def run_pipeline(self):
         """
         Execute the full agent pipeline.
         
         Pipeline: Collector → Processor → Classifier → Advisor
         
+        The collector runs on a background thread and hands over one city
+        at a time, so processing and classifying a city overlaps with
+        downloading the next one. The advisor runs once on the merged result.
+        
         Returns:
             Dictionary with final results and metadata
         """
@@ -70,32 +129,54 @@ class CoordinatorAgent(BaseAgent):
             "advisor": "pending",
         }
         
-        # Step 1: Collect data
-        self.log("Step 1/4: Running Data Collector...")
-        collector_result = self.collector.run()
-        self.pipeline_status["collector"] = collector_result.status
-        
-        if collector_result.status != "success":
-            self.log("ERROR: Pipeline failed at Collector stage")
-            return {"status": "error", "failed_at": "collector", "data": None}
-        
-        # Step 2: Process data
-        self.log("Step 2/4: Running Data Processor...")
-        processor_result = self.processor.run(collector_result)
-        self.pipeline_status["processor"] = processor_result.status
-        
-        if processor_result.status != "success":
-            self.log("ERROR: Pipeline failed at Processor stage")
-            return {"status": "error", "failed_at": "processor", "data": None}
-        
-        # Step 3: Classify data
-        self.log("Step 3/4: Running Quality Classifier...")
-        classifier_result = self.classifier.run(processor_result)
-        self.pipeline_status["classifier"] = classifier_result.status
-        
-        if classifier_result.status != "success":
-            self.log("ERROR: Pipeline failed at Classifier stage")
-            return {"status": "error", "failed_at": "classifier", "data": None}
+        # Steps 1-3: Collect in the background, process and classify each city
+        self.log("Steps 1-3/4: Collecting, processing and classifying city by city...")
+        batches = queue.Queue(maxsize=4)
+        collector_thread = threading.Thread(
+            target=self._collect_in_background, args=(batches,), daemon=True
+        )
+        collector_thread.start()
+        
+        classified_batches = []
+        failed_at = None
+        
+        # Keep draining until the collector finishes, even after a failure,
+        # so the background thread never blocks on a full queue
+        while True:
+            collector_result = batches.get()
+            if collector_result is None:
+                break
+            if failed_at is not None:
+                continue
+            
+            if collector_result.status != "success":
+                failed_at = "collector"
+                continue
+            
+            processor_result = self.processor.run(collector_result)
+            if processor_result.status != "success":
+                failed_at = "processor"
+                continue
+            
+            classifier_result = self.classifier.run(processor_result)
+            if classifier_result.status != "success":
+                failed_at = "classifier"
+                continue
+            
+            classified_batches.append(classifier_result.data)
+        
+        collector_thread.join()
+        
+        for stage in ("collector", "processor", "classifier"):
+            if stage == failed_at:
+                self.pipeline_status[stage] = "error"
+                self.log(f"ERROR: Pipeline failed at {stage.capitalize()} stage")
+                return {"status": "error", "failed_at": stage, "data": None}
+            self.pipeline_status[stage] = "success"
+        
+        classifier_result = self.classifier.create_message(
+            data=self._merge_batches(classified_batches)
+        )
         
         # Step 4: Add health recommendations
         self.log("Step 4/4: Running Health Advisor...")
@@ -7,23 +7,28 @@ It's the SECOND agent in our pipeline.
 Job: Receive raw data → Clean it → Convert to DataFrame → Pass to next agent
 """
 
-import sys
-import os
-
-# Add project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
-
+import numpy as np
 import pandas as pd
 from agents.base_agent import BaseAgent
+from config.aqi_standards import AQI_CATEGORIES
+from config.settings import POLLUTANTS, TARGET_CITIES
+from utils.categoricals import as_category
+
+# Categorical dtypes with a fixed category order, so the integer codes are
+# the same in every run and cached DataFrames compare equal
+_CITY_DTYPE = pd.CategoricalDtype(TARGET_CITIES)
+_PARAMETER_DTYPE = pd.CategoricalDtype(POLLUTANTS)
+_UNIT_DTYPE = pd.CategoricalDtype(["µg/m³"])
+_AQI_LEVEL_DTYPE = pd.CategoricalDtype([category["name"] for category in AQI_CATEGORIES.values()])
+
 
 class DataProcessorAgent(BaseAgent):
     """
     Agent responsible for cleaning and processing raw air quality data.
     """
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, quiet=False):
+        super().__init__(quiet=quiet)
     
     def get_name(self):
         return "DataProcessorAgent"
@@ -40,6 +45,8 @@ class DataProcessorAgent(BaseAgent):
         """
         values = measurements.get("values", [])
         
+        # Values are ordered newest first, so this usually stops after one
+        # or two entries rather than scanning the whole history
         for entry in values:
             value = entry.get("value")
             if value is not None:
@@ -57,12 +64,14 @@ class DataProcessorAgent(BaseAgent):
         Returns:
             DataFrame with columns:
             - city, station_id, station_name
-            - parameter_code, value, unit
+            - parameter_code, value, unit, timestamp
         """
-        rows = []
+        # One list per column, filled in a single pass over the nested data
+        cities, station_ids, station_names, param_codes, values = [], [], [], [], []
         
         cities_data = raw_data.get("cities", {})
-        collection_time = raw_data.get("collection_timestamp")
+        collection_time = pd.Timestamp(raw_data.get("collection_timestamp")).to_datetime64()
+        extract_latest_value = self.extract_latest_value
         
         for city_name, city_data in cities_data.items():
             for station in city_data.get("stations", []):
@@ -74,21 +83,29 @@ class DataProcessorAgent(BaseAgent):
                     param_code = param_info.get("paramCode", "Unknown")
                     
                     measurements = sensor.get("measurements", {})
-                    latest_value = self.extract_latest_value(measurements)
+                    latest_value = extract_latest_value(measurements)
                     
                     # Only add row if we have a valid value
                     if latest_value is not None:
-                        rows.append({
-                            "city": city_name,
-                            "station_id": station_id,
-                            "station_name": station_name,
-                            "parameter_code": param_code,
-                            "value": latest_value,
-                            "unit": "µg/m³",
-                            "timestamp": collection_time,
-                        })
-        
-        df = pd.DataFrame(rows)
+                        cities.append(city_name)
+                        station_ids.append(station_id)
+                        station_names.append(station_name)
+                        param_codes.append(param_code)
+                        values.append(latest_value)
+        
+        row_count = len(values)
+        
+        # Readings and station IDs fit in 32 bits; timestamps only need
+        # seconds. Repeated strings are stored as small integer codes.
+        df = pd.DataFrame({
+            "city": as_category(pd.Series(cities, dtype=object), _CITY_DTYPE),
+            "station_id": np.array(station_ids, dtype=np.int32),
+            "station_name": np.array(station_names, dtype=object),
+            "parameter_code": as_category(pd.Series(param_codes, dtype=object), _PARAMETER_DTYPE),
+            "value": np.array(values, dtype=np.float32),
+            "unit": pd.Categorical.from_codes(np.zeros(row_count, dtype=np.int8), dtype=_UNIT_DTYPE),
+            "timestamp": np.full(row_count, collection_time, dtype="datetime64[s]"),
+        }, copy=False)
         return df
     
     def extract_aqi_data(self, raw_data):
@@ -119,6 +136,10 @@ class DataProcessorAgent(BaseAgent):
                     })
         
         df = pd.DataFrame(rows)
+        
+        if not df.empty:
+            df["city"] = as_category(df["city"], _CITY_DTYPE)
+            df["aqi_level"] = as_category(df["aqi_level"], _AQI_LEVEL_DTYPE)
         return df
     
     def process(self, input_message=None):
@@ -157,7 +178,6 @@ class DataProcessorAgent(BaseAgent):
         processed_data = {
             "measurements": measurements_df,
             "aqi": aqi_df,
-            "raw_data": raw_data,  # Keep raw data for reference
         }
         
         return self.create_message(data=processed_data, status="success")
@@ -169,7 +189,7 @@ if __name__ == "__main__":
     print("=" * 50)
     
     # First, get data from collector
-    from collector_agent import DataCollectorAgent
+    from agents.collector_agent import DataCollectorAgent
     
     collector = DataCollectorAgent()
     raw_message = collector.run()
@@ -6,6 +6,8 @@ Run with: streamlit run app.py
 """
 import sys
 import os
+import html
+import math
 from pathlib import Path
 
 # Add project root to Python path
@@ -14,11 +16,13 @@ sys.path.insert(0, str(project_root))
 
 
 import streamlit as st
+import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
 
 from agents.coordinator_agent import CoordinatorAgent
+from config.aqi_standards import LEVEL_TO_COLOR
+from config.settings import MAIN_POLLUTANTS
 
 
 # Page configuration
@@ -29,16 +33,20 @@ st.set_page_config(
 )
 
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes (300 seconds)
-def get_air_quality_data():
+@st.cache_data(ttl=300, max_entries=1)  # Cache latest result for 5 minutes (300 seconds)
+def get_air_quality_data(_force_refresh=False):
     """
     Run the multi-agent pipeline and get results.
     Cached for 5 minutes to avoid slow reloads.
     
+    Args:
+        _force_refresh: If True, bypass the on-disk API response cache
+            (underscore prefix: Streamlit leaves it out of the cache key)
+    
     Returns:
         Dictionary with air quality data
     """
-    coordinator = CoordinatorAgent()
+    coordinator = CoordinatorAgent(force_refresh=_force_refresh)
     result = coordinator.run()
     
     if result.status == "success":
@@ -82,19 +90,44 @@ def display_city_card(city_data):
         st.write(f"**Sensitive groups:** {city_data['sensitive_advice']}")
 
 
+@st.cache_data(
+    ttl=300,
+    hash_funcs={
+        pd.DataFrame: lambda df: pd.util.hash_pandas_object(df, index=False).values.tobytes(),
+    },
+)
+def get_pollutant_chart_data(measurements_df):
+    """
+    Average level of each main pollutant per city.
+    Cached by the content of the measurements, so reruns with the same
+    data (e.g. after a sidebar click) skip the aggregation.
+    
+    Args:
+        measurements_df: Measurements DataFrame
+    
+    Returns:
+        DataFrame with columns city, parameter_code and value
+    """
+    # Filter to main pollutants only. parameter_code is categorical, so isin
+    # only looks up each category once and then compares integer codes.
+    filtered_df = measurements_df[measurements_df['parameter_code'].isin(MAIN_POLLUTANTS)]
+    
+    return (
+        filtered_df.groupby(['city', 'parameter_code'], observed=True)['value']
+        .mean()
+        .reset_index()
+    )
+
+
 def create_pollutant_chart(measurements_df):
     """
     Create a bar chart showing pollutant levels by city.
     """
-    # Filter to main pollutants only
-    main_pollutants = ['PM2.5', 'PM10', 'NO2', 'SO2', 'O3']
-    filtered_df = measurements_df[measurements_df['parameter_code'].isin(main_pollutants)]
+    chart_data = get_pollutant_chart_data(measurements_df)
     
-    if filtered_df.empty:
+    if chart_data.empty:
         return None
     
-    chart_data = filtered_df.groupby(['city', 'parameter_code'])['value'].mean().reset_index()
-    
     fig = px.bar(
         chart_data,
         x='city',
@@ -117,58 +150,112 @@ def create_pollutant_chart(measurements_df):
     return fig
 
 
-def create_aqi_gauge(city_data):
+# Colored bands of the AQI gauge: (from level, to level, color). The gauge
+# ends at the highest level, so each band takes the color of its lower level.
+GAUGE_MAX_LEVEL = len(LEVEL_TO_COLOR) - 1
+GAUGE_BANDS = [
+    (level, level + 1, color) for level, color in enumerate(LEVEL_TO_COLOR[:GAUGE_MAX_LEVEL])
+]
+
+
+def gauge_point(level, radius):
     """
-    Create a gauge chart for AQI level.
+    Get the point on the gauge for a level (0 = left end, 5 = right end).
     
     Args:
-        city_data: Series with city information
+        level: AQI level
+        radius: Distance from the gauge center
         
     Returns:
-        Plotly figure
+        Tuple of (x, y) SVG coordinates
     """
-    level = city_data['overall_level']
-    category = city_data['overall_category']
-    color = city_data['overall_color']
-    
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number+delta",
-        value=level,
-        number={'suffix': f" - {category}", 'font': {'size': 16, 'color': color}},
-        title={'text': city_data['city'], 'font': {'size': 18}},
-        gauge={
-            'axis': {
-                'range': [0, 5], 
-                'tickvals': [0, 1, 2, 3, 4, 5],
-                'ticktext': ['0', '1', '2', '3', '4', '5'],
-                'tickfont': {'size': 12}
-            },
-            'bar': {'color': color, 'thickness': 0.75},
-            'bgcolor': 'rgba(0,0,0,0)',
-            'borderwidth': 0,
-            'steps': [
-                {'range': [0, 1], 'color': '#00FF00'},   # Very Good - Bright Green
-                {'range': [1, 2], 'color': '#00CC00'},   # Good - Green
-                {'range': [2, 3], 'color': '#FFFF00'},   # Moderate - Yellow
-                {'range': [3, 4], 'color': '#FF9900'},   # Sufficient - Orange
-                {'range': [4, 5], 'color': '#FF0000'},   # Bad/Very Bad - Red
-            ],
-            'threshold': {
-                'line': {'color': "black", 'width': 4},
-                'thickness': 0.8,
-                'value': level
-            }
-        }
-    ))
+    angle = math.pi * (1 - level / GAUGE_MAX_LEVEL)
+    return 100 + radius * math.cos(angle), 110 - radius * math.sin(angle)
+
+
+def gauge_arc(start, end, color, width):
+    """
+    Build an SVG arc along the gauge between two levels.
     
-    fig.update_layout(
-        height=250,
-        margin=dict(l=20, r=20, t=50, b=20),
-        paper_bgcolor='rgba(0,0,0,0)',
-        font={'color': 'white'}
+    Args:
+        start: Level where the arc starts
+        end: Level where the arc ends
+        color: Stroke color
+        width: Stroke width
+        
+    Returns:
+        SVG path element as a string
+    """
+    x1, y1 = gauge_point(start, 80)
+    x2, y2 = gauge_point(end, 80)
+    return (
+        f'<path d="M {x1:.1f} {y1:.1f} A 80 80 0 0 1 {x2:.1f} {y2:.1f}" '
+        f'fill="none" stroke="{color}" stroke-width="{width}"/>'
     )
+
+
+def build_gauge_svg(level):
+    """
+    Pre-render the AQI gauge for one level.
     
-    return fig
+    The city name, category and color are left as {name}, {category} and
+    {color} placeholders, to be filled in with str.format.
+    
+    Args:
+        level: AQI level (-1 for unknown, which draws no needle)
+        
+    Returns:
+        SVG template string
+    """
+    parts = [
+        '<svg viewBox="0 0 200 150" width="100%" xmlns="http://www.w3.org/2000/svg">',
+        '<text x="100" y="16" text-anchor="middle" font-size="16" fill="white">{name}</text>',
+    ]
+    parts += [gauge_arc(start, end, color, 20) for start, end, color in GAUGE_BANDS]
+    
+    if level >= 0:
+        if level > 0:
+            parts.append(gauge_arc(0, level, '{color}', 10))
+        
+        # Black marker across the band at the current level
+        x1, y1 = gauge_point(level, 66)
+        x2, y2 = gauge_point(level, 94)
+        parts.append(
+            f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" '
+            f'stroke="black" stroke-width="4"/>'
+        )
+    
+    parts += [
+        f'<text x="100" y="140" text-anchor="middle" font-size="16" fill="{{color}}">'
+        f'{level} - {{category}}</text>',
+        '</svg>',
+    ]
+    
+    # One line, so Markdown doesn't mistake indented parts for code blocks
+    return ''.join(parts)
+
+
+# Gauge SVG for every AQI level, built once at startup
+LEVEL_TO_SVG = {level: build_gauge_svg(level) for level in range(-1, GAUGE_MAX_LEVEL + 1)}
+
+
+def create_aqi_gauge(city_data):
+    """
+    Create a gauge for a city's AQI level.
+    
+    Args:
+        city_data: Dictionary with city information
+        
+    Returns:
+        SVG markup
+    """
+    svg = LEVEL_TO_SVG.get(city_data['overall_level'], LEVEL_TO_SVG[-1])
+    
+    return svg.format(
+        name=html.escape(str(city_data['city'])),
+        category=html.escape(str(city_data['overall_category'])),
+        color=city_data['overall_color'],
+    )
 
 
 def main():
@@ -184,6 +271,7 @@ def main():
     
     if st.sidebar.button("🔄 Refresh Data"):
         st.cache_data.clear()
+        st.session_state["force_refresh"] = True
         st.rerun()
     
     st.sidebar.markdown("---")
@@ -196,7 +284,7 @@ def main():
     
     # Get data with loading indicator
     with st.spinner("🔄 Fetching real-time air quality data... (this may take up to 1 minute)"):
-        data = get_air_quality_data()
+        data = get_air_quality_data(st.session_state.pop("force_refresh", False))
     
     if data is None:
         st.error("❌ Failed to fetch air quality data. Please try again.")
@@ -206,12 +294,15 @@ def main():
     city_summary = data['city_summary']
     measurements = data['measurements']
     
+    # One plain dictionary per city, shared by the cards and the gauges
+    city_records = city_summary.to_dict('records')
+    
     # Section 1: City Overview Cards
     st.header("📊 Current Air Quality")
     
     cols = st.columns(3)
     
-    for idx, (_, city_data) in enumerate(city_summary.iterrows()):
+    for idx, city_data in enumerate(city_records):
         with cols[idx]:
             display_city_card(city_data)
     
@@ -232,10 +323,9 @@ def main():
     with col2:
         st.subheader("AQI Levels")
         gauge_cols = st.columns(3)
-        for idx, (_, city_data) in enumerate(city_summary.iterrows()):
+        for idx, city_data in enumerate(city_records):
             with gauge_cols[idx]:
-                fig = create_aqi_gauge(city_data)
-                st.plotly_chart(fig, use_container_width=True)
+                st.markdown(create_aqi_gauge(city_data), unsafe_allow_html=True)
     
     st.markdown("---")
     
@@ -245,8 +335,11 @@ def main():
     display_cols = ['city', 'station_name', 'parameter_code', 'value', 'aqi_category']
     available_cols = [col for col in display_cols if col in measurements.columns]
     
+    # Sort by the names, not by the categorical columns' category order
     st.dataframe(
-        measurements[available_cols].sort_values(['city', 'parameter_code']),
+        measurements[available_cols].sort_values(
+            ['city', 'parameter_code'], key=lambda col: col.astype(str)
+        ),
         use_container_width=True,
         hide_index=True
     )
@@ -4,6 +4,10 @@ Polish Air Quality Index (AQI) Standards and Thresholds
 Based on official Polish Air Quality Index from GIOŚ
 """
 
+from types import MappingProxyType
+
+import numpy as np
+
 # AQI Categories with color codes for the UI
 AQI_CATEGORIES = {
     "very_good": {
@@ -97,6 +101,54 @@ AQI_THRESHOLDS = {
     },
 }
 
+# Freeze the standards so they can't be changed at runtime by accident
+AQI_CATEGORIES = MappingProxyType({
+    key: MappingProxyType(category) for key, category in AQI_CATEGORIES.items()
+})
+AQI_THRESHOLDS = MappingProxyType({
+    param: MappingProxyType(thresholds) for param, thresholds in AQI_THRESHOLDS.items()
+})
+
+# Category key, color and English name indexed by AQI level (0 = very good)
+CATEGORY_KEY_BY_LEVEL = tuple(sorted(AQI_CATEGORIES, key=lambda key: AQI_CATEGORIES[key]["level"]))
+LEVEL_TO_COLOR = np.array([AQI_CATEGORIES[key]["color"] for key in CATEGORY_KEY_BY_LEVEL])
+LEVEL_TO_NAME_EN = np.array([AQI_CATEGORIES[key]["name_en"] for key in CATEGORY_KEY_BY_LEVEL])
+
+# The same keys as a NumPy array for vectorized lookups. The threshold edges
+# below follow this order, so they line up with the level tables.
+CATEGORY_NAMES = np.array(CATEGORY_KEY_BY_LEVEL)
+
+# Lowest valid value and upper bound of each category (in CATEGORY_NAMES
+# order) for every pollutant. Each category covers (previous upper, upper].
+THRESHOLD_LOWER = {
+    param: thresholds[CATEGORY_NAMES[0]][0]
+    for param, thresholds in AQI_THRESHOLDS.items()
+}
+THRESHOLD_EDGES = {
+    param: np.array([thresholds[key][1] for key in CATEGORY_NAMES], dtype=np.float64)
+    for param, thresholds in AQI_THRESHOLDS.items()
+}
+
+
+def categorize(param_code, values):
+    """
+    Find the AQI category of many values of one pollutant at once.
+    
+    Values below the lowest threshold (or NaN) are treated as very bad.
+    
+    Args:
+        param_code: Pollutant code with an entry in AQI_THRESHOLDS
+        values: Array of measured values in µg/m³
+        
+    Returns:
+        Array of category keys, one per value
+    """
+    values = np.asarray(values, dtype=np.float64)
+    idx = np.searchsorted(THRESHOLD_EDGES[param_code], values, side='left')
+    idx = np.where(values >= THRESHOLD_LOWER[param_code], idx, len(CATEGORY_NAMES) - 1)
+    return CATEGORY_NAMES[idx]
+
+
 # Health recommendations for each AQI category
 HEALTH_RECOMMENDATIONS = {
     "very_good": {
@@ -2,6 +2,8 @@
 Configuration settings for the Air Quality Monitoring System
 """
 
+import os
+
 # Set to False when you want to use the real GIOŚ API
 USE_MOCK_DATA = False
 
@@ -26,8 +28,45 @@ TARGET_CITIES = [
 # Pollutants we're tracking
 POLLUTANTS = ["PM2.5", "PM10", "NO2", "SO2", "O3", "CO"]
 
+# Pollutants shown in the dashboard chart
+MAIN_POLLUTANTS = ("PM2.5", "PM10", "NO2", "SO2", "O3")
+
 # How often to refresh data (in seconds)
 REFRESH_INTERVAL = 3600  # 1 hour
 
+# How long to keep station metadata between runs (in seconds)
+STATIONS_CACHE_TTL = 24 * 3600  # 24 hours
+SENSORS_CACHE_TTL = 12 * 3600   # 12 hours
+
+# On-disk cache of API responses. Kept as long as the dashboard's own
+# 5 minute cache, so each dashboard refresh sees new measurements.
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+RESPONSE_CACHE_PATH = os.path.join(CACHE_DIR, "gios_responses.sqlite")
+RESPONSE_CACHE_TTL = 5 * 60  # 5 minutes
+
+# Where station metadata is persisted (see STATIONS_CACHE_TTL / SENSORS_CACHE_TTL)
+STATIONS_CACHE_PATH = os.path.join(CACHE_DIR, "gios", "stations.pkl")
+SENSORS_CACHE_PATH = os.path.join(CACHE_DIR, "gios", "sensors.pkl")
+
 # API request timeout
-REQUEST_TIMEOUT = 30
\ No newline at end of file
+REQUEST_TIMEOUT = 30
+
+# HTTP connection pool size (keep >= concurrent requests) and retry count
+HTTP_POOL_SIZE = 32
+HTTP_RETRIES = 3
+
+# Circuit breaker: after this many failed requests in a row to one host,
+# skip requests to it for BREAKER_COOLDOWN seconds
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN = 30
+
+# User-Agent sent with every API request
+USER_AGENT = "poland-aq-mas/1.0"
+
+# Number of concurrent API requests made by the collector
+MAX_WORKERS = 16
+
+# Smallest measurement table classified with the Numba kernel (if installed).
+# Smaller tables (the pipeline has a few dozen rows) use NumPy, which
+# avoids the kernel's compile and thread start-up cost.
+NUMBA_MIN_ROWS = 100_000
@@ -0,0 +1,235 @@
+"""
+Caches for the GIOŚ API client
+
+- ttl_cache: cache for station metadata (the station list and each
+  station's sensors), which changes rarely, so it is kept between pipeline
+  runs - optionally on disk - instead of being re-downloaded on every
+  dashboard refresh. Methods return Uncached(result) for results that
+  should be passed through without being stored.
+- ResponseCache: on-disk cache of every API response, so repeated runs
+  within the data refresh interval skip the network entirely.
+"""
+
+import functools
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class Uncached:
+    """
+    Result of a ttl_cache method that is returned but not cached.
+    
+    Used for incomplete results (e.g. a station list with a failed page),
+    which are better than nothing now but shouldn't be reused later.
+    """
+    
+    __slots__ = ("value",)
+    
+    def __init__(self, value):
+        self.value = value
+
+
+def ttl_cache(ttl, maxsize=1024, persist_path=None):
+    """
+    Cache a method's results for `ttl` seconds.
+    
+    The cache is keyed by the method arguments (not `self`), so it is
+    shared by every client instance. Empty results are not cached, so a
+    failed request is retried on the next call. Neither are results the
+    method wraps in Uncached; the wrapped value is returned as is.
+    
+    If the instance has a true `force_refresh` attribute, cached entries
+    are ignored and the method always runs (its result is still cached).
+    
+    With `persist_path`, entries are also pickled to that file and loaded
+    back on first use, so they survive app restarts.
+    
+    Args:
+        ttl: Time to live for each entry, in seconds
+        maxsize: Maximum number of entries kept (least recently used are dropped)
+        persist_path: Optional file to persist the cache to
+        
+    Returns:
+        Decorator for the method
+    """
+    def decorator(method):
+        cache = OrderedDict()
+        lock = threading.Lock()
+        loaded = [persist_path is None]
+        
+        # Disk writes happen outside `lock`. Changes made while a write is
+        # running are picked up by one more write when it finishes.
+        save_lock = threading.Lock()
+        dirty = [False]
+        
+        def load():
+            """Read persisted entries that haven't expired (call with lock held)."""
+            loaded[0] = True
+            try:
+                with open(persist_path, "rb") as f:
+                    entries = pickle.load(f)
+            except (OSError, pickle.PickleError, EOFError, AttributeError, ValueError):
+                return
+            
+            now = time.time()
+            for args, entry in entries.items():
+                if entry[0] > now:
+                    cache[args] = entry
+        
+        def write(entries):
+            """Write entries to disk atomically."""
+            try:
+                os.makedirs(os.path.dirname(persist_path), exist_ok=True)
+                tmp_path = f"{persist_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, persist_path)
+            except OSError:
+                pass
+        
+        def save():
+            """Persist the cache if it changed (call without lock held)."""
+            # If another thread is writing, it re-checks `dirty` afterwards
+            while dirty[0] and save_lock.acquire(blocking=False):
+                try:
+                    with lock:
+                        if not dirty[0]:
+                            continue
+                        dirty[0] = False
+                        entries = dict(cache)
+                    write(entries)
+                finally:
+                    save_lock.release()
+        
+        @functools.wraps(method)
+        def wrapper(self, *args):
+            # Wall-clock time, so persisted expiry times stay valid after a restart
+            now = time.time()
+            
+            with lock:
+                if not loaded[0]:
+                    load()
+                
+                entry = None if getattr(self, "force_refresh", False) else cache.get(args)
+                if entry is not None and entry[0] > now:
+                    cache.move_to_end(args)
+                    return entry[1]
+            
+            result = method(self, *args)
+            if isinstance(result, Uncached):
+                return result.value
+            
+            if result:
+                with lock:
+                    cache[args] = (now + ttl, result)
+                    cache.move_to_end(args)
+                    while len(cache) > maxsize:
+                        cache.popitem(last=False)
+                    dirty[0] = persist_path is not None
+                
+                save()
+            
+            return result
+        
+        def cache_clear():
+            """Drop all cached entries (including the persisted copy)."""
+            with lock:
+                cache.clear()
+                loaded[0] = True
+                dirty[0] = persist_path is not None
+            
+            save()
+        
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    
+    return decorator
+
+
+class ResponseCache:
+    """
+    Persistent cache of parsed API responses, keyed by URL.
+    
+    Entries are stored in a SQLite file so they survive app restarts.
+    Values are pickled parsed JSON, so a hit skips both the HTTP request
+    and JSON parsing. If the cache file can't be used, every lookup is a
+    miss and nothing is stored.
+    """
+    
+    def __init__(self, path, ttl):
+        """
+        Open (or create) the cache file.
+        
+        Args:
+            path: Path of the SQLite file
+            ttl: Time to live for each entry, in seconds
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+            with self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(url TEXT PRIMARY KEY, expires_at REAL, value BLOB)"
+                )
+                self._db.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+        except (OSError, sqlite3.Error):
+            self._db = None
+    
+    def get(self, url):
+        """
+        Look up a cached response.
+        
+        Args:
+            url: Request URL
+            
+        Returns:
+            The cached parsed response, or None if missing or expired
+        """
+        if self._db is None:
+            return None
+        
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT value FROM responses WHERE url = ? AND expires_at >= ?",
+                    (url, time.time()),
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        
+        return pickle.loads(row[0]) if row else None
+    
+    def set(self, url, value):
+        """
+        Store a parsed response.
+        
+        Args:
+            url: Request URL
+            value: Parsed JSON response
+        """
+        if self._db is None:
+            return
+        
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            with self._lock, self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                    (url, time.time() + self.ttl, blob),
+                )
+        except sqlite3.Error:
+            pass
+    
+    def close(self):
+        """Close the cache file."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -5,15 +5,79 @@ This client makes actual HTTP requests to the GIOŚ air quality API.
 API Documentation: https://powietrze.gios.gov.pl/pjp/content/api
 """
 
-import sys
-import os
-
-# Add project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
+from urllib.parse import urlsplit
 
 import requests
-from config.settings import ENDPOINTS, REQUEST_TIMEOUT
+try:
+    import orjson  # Optional: faster JSON parsing
+except ImportError:
+    orjson = None
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config.settings import (
+    ENDPOINTS,
+    REQUEST_TIMEOUT,
+    HTTP_POOL_SIZE,
+    HTTP_RETRIES,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_COOLDOWN,
+    MAX_WORKERS,
+    STATIONS_CACHE_TTL,
+    SENSORS_CACHE_TTL,
+    RESPONSE_CACHE_PATH,
+    RESPONSE_CACHE_TTL,
+    STATIONS_CACHE_PATH,
+    SENSORS_CACHE_PATH,
+    USER_AGENT,
+)
+from utils.api_cache import ResponseCache, Uncached, ttl_cache
+
+
+def _field_getter(*keys):
+    """
+    Build a function that reads several fields of an API record at once.
+    
+    All keys are looked up with a single itemgetter call. A record missing
+    one of the keys falls back to dict.get, so missing fields are None.
+    
+    Args:
+        *keys: Polish field names to read (at least two)
+        
+    Returns:
+        Function taking a record and returning a tuple of field values
+    """
+    getter = itemgetter(*keys)
+    
+    def get_fields(record):
+        try:
+            return getter(record)
+        except KeyError:
+            return tuple(map(record.get, keys))
+    
+    return get_fields
+
+
+_get_station_fields = _field_getter(
+    "Identyfikator stacji",
+    "Nazwa stacji",
+    "WGS84 φ N",
+    "WGS84 λ E",
+    "Identyfikator miasta",
+    "Nazwa miasta",
+    "Ulica",
+)
+_get_sensor_fields = _field_getter(
+    "Identyfikator stanowiska",
+    "Identyfikator stacji",
+    "Wskaźnik",
+    "Wskaźnik - wzór",
+    "Wskaźnik - kod",
+)
+_get_measurement_fields = _field_getter("Data", "Wartość")
 
 
 class GIOSApiClient:
@@ -22,19 +86,97 @@ class GIOSApiClient:
     Fetches live data from Polish government servers.
     """
     
-    def __init__(self, verbose=False):
+    def __init__(self, verbose=False, force_refresh=False):
         """
         Initialize the API client.
         
         Args:
             verbose: If True, print error messages. If False, fail silently.
+            force_refresh: If True, ignore cached responses and station
+                metadata and fetch everything again (fresh results are still
+                written to the caches)
         """
         self.timeout = REQUEST_TIMEOUT
         self.verbose = verbose
+        self.force_refresh = force_refresh
+        self.cache = ResponseCache(RESPONSE_CACHE_PATH, RESPONSE_CACHE_TTL)
+        
+        # One session for all requests, so connections (and TLS handshakes)
+        # are reused instead of opening a new one per call. Responses are
+        # requested as compressed JSON.
+        # Server errors are retried and a failed connect is retried once.
+        # Read timeouts are not retried (read=False raises them as is), so a
+        # hung host costs one timeout and reaches the circuit breaker.
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=Retry(
+                total=HTTP_RETRIES,
+                connect=1,
+                read=False,
+                backoff_factor=0.3,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=("GET",),
+            ),
+        )
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+            "User-Agent": USER_AGENT,
+        })
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # Thread pool for the bulk methods, created on first use. The bulk
+        # methods are called from several threads at once, so creation is
+        # locked to make sure only one pool is ever started.
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        
+        # Circuit breaker state per host: consecutive failures, and the
+        # time.monotonic() until which requests to the host are skipped
+        self._breaker_lock = threading.Lock()
+        self._breaker_failures = {}
+        self._breaker_open_until = {}
+    
+    def _breaker_is_open(self, host):
+        """
+        Check whether requests to a host are currently being skipped.
+        
+        Args:
+            host: Host name (with port, if any)
+            
+        Returns:
+            True if the host failed repeatedly and is still cooling down
+        """
+        with self._breaker_lock:
+            return time.monotonic() < self._breaker_open_until.get(host, 0)
+    
+    def _record_result(self, host, failed):
+        """
+        Update the circuit breaker after a request.
+        
+        Args:
+            host: Host name (with port, if any)
+            failed: True if the host timed out, refused or returned a server error
+        """
+        with self._breaker_lock:
+            if not failed:
+                self._breaker_failures.pop(host, None)
+                return
+            
+            failures = self._breaker_failures.get(host, 0) + 1
+            self._breaker_failures[host] = failures
+            if failures >= BREAKER_FAILURE_THRESHOLD:
+                self._breaker_open_until[host] = time.monotonic() + BREAKER_COOLDOWN
     
     def _make_request(self, url):
         """
         Make HTTP GET request to the API.
+        Successful responses are served from the on-disk cache when fresh.
+        Server errors are retried with backoff, read timeouts are not; a host
+        that keeps failing is skipped for BREAKER_COOLDOWN seconds instead of waiting on timeouts.
         
         Args:
             url: Full URL to request
@@ -42,77 +184,137 @@ class GIOSApiClient:
         Returns:
             JSON response as dictionary/list, or None if request fails
         """
+        if not self.force_refresh:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return cached
+        
+        host = urlsplit(url).netloc
+        if self._breaker_is_open(host):
+            if self.verbose:
+                print(f"ERROR: Skipping {url}: {host} keeps failing")
+            return None
+        
         try:
-            response = requests.get(url, timeout=self.timeout)
+            response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
-            return response.json()
         except requests.exceptions.Timeout:
+            self._record_result(host, failed=True)
             if self.verbose:
                 print(f"ERROR: Request timeout for {url}")
             return None
         except requests.exceptions.HTTPError as e:
+            # Client errors (e.g. an unknown sensor) don't mean the host is down
+            self._record_result(host, failed=e.response is not None and e.response.status_code >= 500)
             if self.verbose:
                 print(f"ERROR: HTTP error for {url}: {e}")
             return None
         except requests.exceptions.RequestException as e:
+            # Connection errors, and server errors that outlasted the retries
+            self._record_result(host, failed=True)
             if self.verbose:
                 print(f"ERROR: Request failed for {url}: {e}")
             return None
+        
+        # The host answered, so a bad body doesn't count against the breaker.
+        # Parsed outside the request's try: requests' JSONDecodeError is also
+        # a RequestException. orjson's errors are ValueErrors too.
+        self._record_result(host, failed=False)
+        try:
+            data = orjson.loads(response.content) if orjson is not None else response.json()
         except ValueError as e:
             if self.verbose:
                 print(f"ERROR: Failed to parse JSON from {url}: {e}")
             return None
+        
+        self.cache.set(url, data)
+        return data
     
+    @ttl_cache(ttl=STATIONS_CACHE_TTL, maxsize=1, persist_path=STATIONS_CACHE_PATH)
     def get_all_stations(self):
         """
         Fetch all air quality monitoring stations in Poland.
-        Handles pagination to get ALL stations.
+        Handles pagination to get ALL stations: after the first page, the
+        remaining pages are fetched concurrently.
+        Results are cached for STATIONS_CACHE_TTL seconds. If some pages
+        fail, the stations from the other pages are returned but not cached,
+        so the missing ones aren't hidden until the cache expires.
         
         Returns:
             List of station dictionaries (transformed to English keys)
         """
         url = ENDPOINTS["all_stations"]
+        
+        def fetch_page(page):
+            return self._make_request(f"{url}?page={page}")
+        
+        response = fetch_page(1)
+        if not response:
+            return []
+        
+        if isinstance(response, dict):
+            total_pages = response.get('totalPages', 1)
+        else:
+            total_pages = 1
+        
+        # The page count is known after the first page, so fetch the rest
+        # concurrently. Pages that did load stay in the response cache, so
+        # retrying after a failure only re-downloads the missing ones.
+        responses = {1: response}
+        responses.update(self._fetch_concurrently(fetch_page, range(2, total_pages + 1)))
+        
         all_stations = []
-        page = 1
+        for page in sorted(responses):
+            all_stations.extend(self._transform_stations(responses[page]))
         
-        while True:
-            page_url = f"{url}?page={page}"
-            response = self._make_request(page_url)
-            
-            if not response:
-                break
-            
-            if isinstance(response, dict):
-                raw_stations = response.get('Lista stacji pomiarowych', [])
-                total_pages = response.get('totalPages', 1)
-            else:
-                raw_stations = response if response else []
-                total_pages = 1
-            
-            # Transform Polish keys to English keys
-            for station in raw_stations:
-                all_stations.append({
-                    "id": station.get("Identyfikator stacji"),
-                    "stationName": station.get("Nazwa stacji"),
-                    "gegrLat": station.get("WGS84 φ N"),
-                    "gegrLon": station.get("WGS84 λ E"),
-                    "city": {
-                        "id": station.get("Identyfikator miasta"),
-                        "name": station.get("Nazwa miasta"),
-                    },
-                    "addressStreet": station.get("Ulica"),
-                })
-            
-            if page >= total_pages:
-                break
-            
-            page += 1
+        if any(page_response is None for page_response in responses.values()):
+            if self.verbose:
+                print("ERROR: Station list incomplete, some pages failed")
+            return Uncached(all_stations)
         
         return all_stations
+    
+    def _transform_stations(self, response):
+        """
+        Convert one page of the station list to English keys.
+        
+        Args:
+            response: Parsed station list page (None if the request failed)
+            
+        Returns:
+            List of station dictionaries
+        """
+        if not response:
+            return []
+        
+        if isinstance(response, dict):
+            raw_stations = response.get('Lista stacji pomiarowych', [])
+        else:
+            raw_stations = response
+        
+        # Transform Polish keys to English keys
+        return [
+            {
+                "id": station_id,
+                "stationName": name,
+                "gegrLat": lat,
+                "gegrLon": lon,
+                "city": {
+                    "id": city_id,
+                    "name": city_name,
+                },
+                "addressStreet": street,
+            }
+            for station_id, name, lat, lon, city_id, city_name, street in map(
+                _get_station_fields, raw_stations
+            )
+        ]
 
+    @ttl_cache(ttl=SENSORS_CACHE_TTL, persist_path=SENSORS_CACHE_PATH)
     def get_station_sensors(self, station_id):
         """
         Fetch all sensors for a specific station.
+        Results are cached for SENSORS_CACHE_TTL seconds.
         
         Args:
             station_id: ID of the station
@@ -133,14 +335,14 @@ class GIOSApiClient:
         
         # Transform Polish keys to English keys
         sensors = []
-        for sensor in raw_sensors:
+        for sensor_id, sensor_station_id, name, formula, code in map(_get_sensor_fields, raw_sensors):
             sensors.append({
-                "id": sensor.get("Identyfikator stanowiska"),
-                "stationId": sensor.get("Identyfikator stacji"),
+                "id": sensor_id,
+                "stationId": sensor_station_id,
                 "param": {
-                    "paramName": sensor.get("Wskaźnik"),
-                    "paramFormula": sensor.get("Wskaźnik - wzór"),
-                    "paramCode": sensor.get("Wskaźnik - kod"),
+                    "paramName": name,
+                    "paramFormula": formula,
+                    "paramCode": code,
                 }
             })
         
@@ -168,12 +370,10 @@ class GIOSApiClient:
             raw_data = []
         
         # Transform Polish keys to English keys
-        values = []
-        for item in raw_data:
-            values.append({
-                "date": item.get("Data"),
-                "value": item.get("Wartość"),
-            })
+        values = [
+            {"date": date, "value": value}
+            for date, value in map(_get_measurement_fields, raw_data)
+        ]
         
         # Extract parameter code from station code
         key = ""
@@ -220,9 +420,58 @@ class GIOSApiClient:
         
         return aqi
     
+    def _fetch_concurrently(self, fetch, ids):
+        """
+        Call `fetch` for every id on the client's thread pool.
+        
+        Args:
+            fetch: Method taking a single id
+            ids: Iterable of ids
+            
+        Yields:
+            Tuples of (id, result) in completion order
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+            executor = self._executor
+        
+        futures = {executor.submit(fetch, item_id): item_id for item_id in ids}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    
+    def get_sensors_bulk(self, station_ids):
+        """
+        Fetch sensors for many stations concurrently.
+        
+        Args:
+            station_ids: Iterable of station IDs
+            
+        Yields:
+            Tuples of (station_id, sensors) as each request completes
+        """
+        return self._fetch_concurrently(self.get_station_sensors, station_ids)
+    
+    def get_sensor_data_bulk(self, sensor_ids):
+        """
+        Fetch measurement data for many sensors concurrently.
+        
+        Args:
+            sensor_ids: Iterable of sensor IDs
+            
+        Yields:
+            Tuples of (sensor_id, data) as each request completes
+        """
+        return self._fetch_concurrently(self.get_sensor_data, sensor_ids)
+    
     def close(self):
-        """Cleanup (nothing to do for requests library)."""
-        pass
+        """Close the HTTP session, the bulk-request thread pool and the cache."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        self.session.close()
+        self.cache.close()
 
 
 # Test the API client
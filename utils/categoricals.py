@@ -0,0 +1,41 @@
+"""
+Categorical column helpers for the agents' DataFrames
+
+Low-cardinality string columns (cities, pollutant codes, AQI categories)
+are stored as pandas categoricals, so each string is kept once and rows
+hold small integer codes.
+"""
+
+import pandas as pd
+
+
+def as_category(column, dtype):
+    """
+    Convert a column to a categorical based on a predefined dtype.
+    
+    Values the dtype doesn't know (e.g. cities outside TARGET_CITIES) are
+    added after its categories instead of becoming missing.
+    
+    Args:
+        column: Series to convert
+        dtype: Predefined CategoricalDtype
+        
+    Returns:
+        Categorical Series
+    """
+    extra = column[~column.isin(dtype.categories)].dropna().unique().tolist()
+    if extra:
+        dtype = pd.CategoricalDtype(list(dtype.categories) + extra)
+    return column.astype(dtype)
+
+
+def as_category_columns(df, columns):
+    """
+    Convert columns of a DataFrame to categoricals in place.
+    
+    Args:
+        df: DataFrame to modify
+        columns: Names of the columns to convert
+    """
+    for col in columns:
+        df[col] = df[col].astype('category')
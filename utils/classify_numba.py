@@ -0,0 +1,66 @@
+"""
+Numba-compiled AQI classification kernel
+
+Classifies a whole column of measurements in one compiled, parallel loop.
+Callers check NUMBA_AVAILABLE and fall back to the pandas implementation.
+"""
+
+import numpy as np
+
+from utils.lazy_numba import NUMBA_AVAILABLE, lazy_kernel
+
+
+@lazy_kernel
+def _get_kernel():
+    """Compile the classification kernel."""
+    from numba import njit, prange
+    
+    @njit(parallel=True, cache=True)
+    def _classify(values, param_rows, edges, key_ids, unknown_id, out_of_range_id, out):
+        for i in prange(values.size):
+            p = param_rows[i]
+            if p < 0:
+                out[i] = unknown_id
+                continue
+            
+            value = values[i]
+            # Written as "not >=" so NaN is treated as out of range too
+            if not value >= edges[p, 0]:
+                out[i] = out_of_range_id
+                continue
+            
+            b = np.searchsorted(edges[p], value, side='left') - 1
+            out[i] = key_ids[p, max(b, 0)]
+    
+    return _classify
+
+
+def classify_codes(values, param_rows, edges, key_ids, unknown_id, out_of_range_id):
+    """
+    Classify measurements into category ids.
+    
+    Bin b of parameter p covers (edges[p, b], edges[p, b + 1]], with the
+    first bin also including edges[p, 0].
+    
+    Args:
+        values: float64 array of measured values
+        param_rows: int array - row of `edges` for each value (-1 if unknown)
+        edges: 2D float64 array of bin edges, one row per parameter
+        key_ids: 2D int array - category id of each bin, one row per parameter
+        unknown_id: Category id for values with an unknown parameter
+        out_of_range_id: Category id for values below every bin (or NaN)
+    
+    Returns:
+        int64 array of category ids, one per value
+    """
+    out = np.empty(values.size, dtype=np.int64)
+    _get_kernel()(
+        np.ascontiguousarray(values, dtype=np.float64),
+        np.ascontiguousarray(param_rows, dtype=np.int64),
+        edges,
+        key_ids,
+        unknown_id,
+        out_of_range_id,
+        out,
+    )
+    return out
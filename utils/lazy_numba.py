@@ -0,0 +1,28 @@
+"""
+Lazy compilation of optional Numba kernels
+
+Numba is optional: when it is not installed NUMBA_AVAILABLE is False and
+callers should fall back to their NumPy/pandas implementation. Numba is
+only imported (and a kernel compiled) the first time the kernel is used.
+"""
+
+import functools
+import importlib.util
+
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+
+def lazy_kernel(build):
+    """
+    Decorate a function that imports Numba and returns a compiled kernel.
+    
+    The decorated function builds the kernel on its first call and returns
+    the same kernel on every later call.
+    
+    Args:
+        build: Function without arguments returning the compiled kernel
+        
+    Returns:
+        Function without arguments returning the kernel
+    """
+    return functools.lru_cache(maxsize=None)(build)
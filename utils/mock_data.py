@@ -5,12 +5,39 @@ This provides sample data that mimics GIOŚ API responses.
 Used for development and testing when the real API is not accessible.
 """
 
-import random
+import time
+from bisect import bisect
 from datetime import datetime, timedelta
+from functools import partial
+from itertools import accumulate
+from random import random
+from types import MappingProxyType
+
+import numpy as np
+
+from utils.mock_numba import NUMBA_AVAILABLE, generate_values
+
+
+def _freeze(value):
+    """
+    Make nested mock data read-only: dicts become MappingProxyType and
+    lists become tuples, so callers can share it without copying.
+    
+    Args:
+        value: Dictionary, list or plain value
+        
+    Returns:
+        Read-only version of `value`
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
 
 
 # Sample stations (based on real GIOŚ data structure)
-MOCK_STATIONS = [
+MOCK_STATIONS = _freeze([
     # Warsaw stations
     {
         "id": 114,
@@ -62,10 +89,22 @@ MOCK_STATIONS = [
         "city": {"id": 3, "name": "Wrocław"},
         "addressStreet": "ul. Korzeniowskiego"
     },
-]
+])
+
+# Station ID → station, for direct lookups
+_STATION_BY_ID = MappingProxyType({station["id"]: station for station in MOCK_STATIONS})
+
+# The same stations as parallel NumPy arrays (one entry per station), for
+# vectorized filtering by city or location. Read-only, as they are shared.
+STATION_IDS = np.array([s["id"] for s in MOCK_STATIONS], dtype=np.int64)
+STATION_LAT = np.array([float(s["gegrLat"]) for s in MOCK_STATIONS])
+STATION_LON = np.array([float(s["gegrLon"]) for s in MOCK_STATIONS])
+STATION_CITY_ID = np.array([s["city"]["id"] for s in MOCK_STATIONS], dtype=np.int32)
+for _array in (STATION_IDS, STATION_LAT, STATION_LON, STATION_CITY_ID):
+    _array.setflags(write=False)
 
 # Sensors for each station
-MOCK_SENSORS = {
+MOCK_SENSORS = _freeze({
     114: [
         {"id": 672, "stationId": 114, "param": {"paramName": "pył zawieszony PM2.5", "paramFormula": "PM2.5", "paramCode": "PM2.5"}},
         {"id": 673, "stationId": 114, "param": {"paramName": "pył zawieszony PM10", "paramFormula": "PM10", "paramCode": "PM10"}},
@@ -92,8 +131,18 @@ MOCK_SENSORS = {
         {"id": 720, "stationId": 118, "param": {"paramName": "pył zawieszony PM2.5", "paramFormula": "PM2.5", "paramCode": "PM2.5"}},
         {"id": 721, "stationId": 118, "param": {"paramName": "pył zawieszony PM10", "paramFormula": "PM10", "paramCode": "PM10"}},
     ],
+})
+
+# Sensor ID → parameter code, so get_sensor_data doesn't scan every station
+SENSOR_PARAM_INDEX = {
+    sensor["id"]: sensor["param"]["paramCode"]
+    for station_sensors in MOCK_SENSORS.values()
+    for sensor in station_sensors
 }
 
+# Random generator for mock measurement values
+_RNG = np.random.default_rng()
+
 # Typical value ranges for each pollutant (µg/m³)
 POLLUTANT_RANGES = {
     "PM2.5": (5, 80),
@@ -104,36 +153,185 @@ POLLUTANT_RANGES = {
     "CO": (200, 5000),
 }
 
+# (minimum, midpoint) of each range: base values are drawn between the two
+POLLUTANT_STATS = {
+    code: (min_val, (min_val + max_val) / 2)
+    for code, (min_val, max_val) in POLLUTANT_RANGES.items()
+}
+_DEFAULT_STATS = (10, 55)
+
+# Base value draw for each pollutant, with its range already bound
+_BASE_VALUE_BY_CODE = {
+    code: partial(_RNG.uniform, min_val, mid_val)
+    for code, (min_val, mid_val) in POLLUTANT_STATS.items()
+}
+_default_base_value = partial(_RNG.uniform, *_DEFAULT_STATS)
+
+# Last datetime.now() result and the time.monotonic() tick it was taken at
+_cached_now = (float("-inf"), None)
 
-def generate_sensor_values(param_code, num_values=24):
+
+def _now():
+    """
+    Return the current local time, reusing it for calls within one second.
+    
+    Bursts of calls (e.g. generating data for every sensor) share one
+    datetime.now() call.
+    
+    Returns:
+        datetime
+    """
+    global _cached_now
+    
+    tick, now = _cached_now
+    current_tick = time.monotonic()
+    if current_tick - tick >= 1.0:
+        now = datetime.now()
+        _cached_now = (current_tick, now)
+    
+    return now
+
+
+# Formatted hourly timestamps, keyed by (current hour, number of values)
+_TIMESTAMP_CACHE = {}
+_TIMESTAMP_CACHE_SIZE = 8
+
+
+def hourly_timestamps(num_values):
+    """
+    Get formatted timestamps for the current hour and the hours before it.
+    
+    Like real GIOŚ data, timestamps fall on the full hour, so the strings
+    are computed once per hour and reused by every sensor.
+    
+    Args:
+        num_values: Number of hourly timestamps
+        
+    Returns:
+        List of "YYYY-MM-DD HH:MM:SS" strings, newest first
+    """
+    hour = _now().replace(minute=0, second=0, microsecond=0)
+    key = (hour, num_values)
+    
+    timestamps = _TIMESTAMP_CACHE.get(key)
+    if timestamps is None:
+        if len(_TIMESTAMP_CACHE) >= _TIMESTAMP_CACHE_SIZE:
+            _TIMESTAMP_CACHE.clear()
+        
+        timestamps = [
+            (hour - timedelta(hours=i)).isoformat(sep=" ", timespec="seconds")
+            for i in range(num_values)
+        ]
+        _TIMESTAMP_CACHE[key] = timestamps
+    
+    return timestamps
+
+
+def _sensor_values(param_code, num_values):
+    """
+    Generate one sensor's hourly values around a random base value.
+    
+    Args:
+        param_code: Pollutant code (PM2.5, PM10, etc.)
+        num_values: Number of hourly values to generate
+        
+    Returns:
+        List of values, newest first
+    """
+    base_value = _BASE_VALUE_BY_CODE.get(param_code, _default_base_value)()
+    
+    # Add random variation to every hour at once
+    if NUMBA_AVAILABLE:
+        values = generate_values(base_value, num_values)
+    else:
+        variations = _RNG.uniform(-0.2, 0.2, num_values) * base_value
+        values = np.maximum(0, base_value + variations).round(2)
+    
+    return values.tolist()
+
+
+def generate_sensor_values_tuples(param_code, num_values=24):
+    """
+    Generate realistic sensor measurement values as compact tuples.
+    
+    Args:
+        param_code: Pollutant code (PM2.5, PM10, etc.)
+        num_values: Number of hourly values to generate
+        
+    Returns:
+        List of (date, value) tuples, newest first
+    """
+    return list(zip(hourly_timestamps(num_values), _sensor_values(param_code, num_values)))
+
+
+def generate_sensor_values(param_code, num_values=24, out=None):
     """
     Generate realistic sensor measurement values.
     
+    Callers that read the results before the next call (e.g. benchmark
+    loops) can pass the previous result back as `out` to have its
+    dictionaries overwritten instead of allocating new ones.
+    
     Args:
         param_code: Pollutant code (PM2.5, PM10, etc.)
         num_values: Number of hourly values to generate
+        out: Optional list of num_values dictionaries to fill in place
         
     Returns:
-        List of measurement dictionaries with date and value
+        List of measurement dictionaries with date and value (`out` if given)
+    """
+    timestamps = hourly_timestamps(num_values)
+    values = _sensor_values(param_code, num_values)
+    
+    if out is not None and len(out) == num_values:
+        for measurement, date, value in zip(out, timestamps, values):
+            measurement["date"] = date
+            measurement["value"] = value
+        return out
+    
+    return [{"date": date, "value": value} for date, value in zip(timestamps, values)]
+
+
+def generate_all_sensor_values(param_codes, num_values=24):
     """
-    values = []
-    min_val, max_val = POLLUTANT_RANGES.get(param_code, (10, 100))
+    Generate measurement values for many sensors at once.
     
-    now = datetime.now()
-    base_value = random.uniform(min_val, (min_val + max_val) / 2)
+    All random numbers are drawn in one call, as a (sensors x hours) array.
     
-    for i in range(num_values):
-        timestamp = now - timedelta(hours=i)
-        # Add random variation
-        variation = random.uniform(-0.2, 0.2) * base_value
-        value = max(0, base_value + variation)
+    Args:
+        param_codes: Pollutant code of each sensor
+        num_values: Number of hourly values per sensor
         
-        values.append({
-            "date": timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-            "value": round(value, 2)
-        })
+    Returns:
+        List with one list of measurement dictionaries per sensor
+    """
+    stats = np.array(
+        [POLLUTANT_STATS.get(code, _DEFAULT_STATS) for code in param_codes],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+    base_values = _RNG.uniform(stats[:, 0], stats[:, 1])[:, None]
     
-    return values
+    variations = _RNG.uniform(-0.2, 0.2, (len(stats), num_values)) * base_values
+    values = np.clip(base_values + variations, 0, None).round(2)
+    
+    timestamps = hourly_timestamps(num_values)
+    return [
+        [{"date": date, "value": value} for date, value in zip(timestamps, row)]
+        for row in values.tolist()
+    ]
+
+
+# AQI levels returned by the mock API, and how often each one comes up
+# (weighted towards better quality), as cumulative weights for bisect
+_AQI_LEVELS = _freeze([
+    {"id": 0, "indexLevelName": "Bardzo dobry"},
+    {"id": 1, "indexLevelName": "Dobry"},
+    {"id": 2, "indexLevelName": "Umiarkowany"},
+    {"id": 3, "indexLevelName": "Dostateczny"},
+    {"id": 4, "indexLevelName": "Zły"},
+    {"id": 5, "indexLevelName": "Bardzo zły"},
+])
+_AQI_CUM_WEIGHTS = list(accumulate([0.15, 0.30, 0.25, 0.15, 0.10, 0.05]))
 
 
 def get_mock_aqi(station_id):
@@ -146,25 +344,15 @@ def get_mock_aqi(station_id):
     Returns:
         Dictionary mimicking GIOŚ API AQI response
     """
-    levels = [
-        {"id": 0, "indexLevelName": "Bardzo dobry"},
-        {"id": 1, "indexLevelName": "Dobry"},
-        {"id": 2, "indexLevelName": "Umiarkowany"},
-        {"id": 3, "indexLevelName": "Dostateczny"},
-        {"id": 4, "indexLevelName": "Zły"},
-        {"id": 5, "indexLevelName": "Bardzo zły"},
-    ]
-    
     # Random AQI level (weighted towards better quality)
-    weights = [0.15, 0.30, 0.25, 0.15, 0.10, 0.05]
-    level_index = random.choices(range(6), weights=weights)[0]
+    level_index = bisect(_AQI_CUM_WEIGHTS, random() * _AQI_CUM_WEIGHTS[-1])
     
-    now = datetime.now()
+    now = _now()
     
     return {
         "id": station_id,
-        "stCalcDate": now.strftime("%Y-%m-%d %H:%M:%S"),
-        "stIndexLevel": levels[level_index],
+        "stCalcDate": now.isoformat(sep=" ", timespec="seconds"),
+        "stIndexLevel": _AQI_LEVELS[level_index],
     }
 
 
@@ -174,23 +362,45 @@ class MockGIOSApiClient:
     Mimics the real GIOŚ API structure.
     """
     
+    def __init__(self, verbose=False, force_refresh=False):
+        """Accepts the same options as GIOSApiClient (nothing is cached here)."""
+        self.verbose = verbose
+        self.force_refresh = force_refresh
+    
     def get_all_stations(self):
-        """Return all mock stations."""
+        """Return all mock stations (the same read-only tuple on every call)."""
         return MOCK_STATIONS
     
+    def iter_stations(self):
+        """Yield mock stations one at a time."""
+        return iter(MOCK_STATIONS)
+    
+    def get_station(self, station_id):
+        """Return one mock station by ID, or None if there is no such station."""
+        return _STATION_BY_ID.get(station_id)
+    
+    def get_all_stations_soa(self):
+        """
+        Return all mock stations as parallel NumPy arrays.
+        
+        Returns:
+            Dictionary with read-only arrays "id", "lat", "lon" and "city_id"
+        """
+        return {
+            "id": STATION_IDS,
+            "lat": STATION_LAT,
+            "lon": STATION_LON,
+            "city_id": STATION_CITY_ID,
+        }
+    
     def get_station_sensors(self, station_id):
-        """Return sensors for a specific station."""
-        return MOCK_SENSORS.get(station_id, [])
+        """Return sensors for a specific station (a shared read-only tuple)."""
+        return MOCK_SENSORS.get(station_id, ())
     
     def get_sensor_data(self, sensor_id):
         """Return mock sensor measurement data."""
-        # Find which parameter this sensor measures
-        param_code = "PM10"  # Default
-        for station_sensors in MOCK_SENSORS.values():
-            for sensor in station_sensors:
-                if sensor["id"] == sensor_id:
-                    param_code = sensor["param"]["paramCode"]
-                    break
+        # Find which parameter this sensor measures (PM10 by default)
+        param_code = SENSOR_PARAM_INDEX.get(sensor_id, "PM10")
         
         return {
             "key": param_code,
@@ -201,6 +411,20 @@ class MockGIOSApiClient:
         """Return mock AQI data for a station."""
         return get_mock_aqi(station_id)
     
+    def get_sensors_bulk(self, station_ids):
+        """Yield (station_id, sensors) for each station."""
+        for station_id in station_ids:
+            yield station_id, self.get_station_sensors(station_id)
+    
+    def get_sensor_data_bulk(self, sensor_ids):
+        """Yield (sensor_id, data) for each sensor, generating all values in one batch."""
+        sensor_ids = list(sensor_ids)
+        param_codes = [SENSOR_PARAM_INDEX.get(sensor_id, "PM10") for sensor_id in sensor_ids]
+        
+        all_values = generate_all_sensor_values(param_codes)
+        for sensor_id, param_code, values in zip(sensor_ids, param_codes, all_values):
+            yield sensor_id, {"key": param_code, "values": values}
+    
     def close(self):
         """No-op for mock client."""
         pass
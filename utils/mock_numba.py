@@ -0,0 +1,43 @@
+"""
+Numba-compiled kernel for mock sensor values
+
+Generates a sensor's hourly values in one compiled loop. Callers check
+NUMBA_AVAILABLE and fall back to the NumPy implementation.
+"""
+
+import numpy as np
+
+from utils.lazy_numba import NUMBA_AVAILABLE, lazy_kernel
+
+
+@lazy_kernel
+def _get_kernel():
+    """Compile the value generation kernel."""
+    from numba import njit
+    
+    @njit(cache=True)
+    def _generate(base_value, num_values):
+        out = np.empty(num_values)
+        for i in range(num_values):
+            value = base_value + np.random.uniform(-0.2, 0.2) * base_value
+            out[i] = round(max(0.0, value), 2)
+        return out
+    
+    return _generate
+
+
+def generate_values(base_value, num_values):
+    """
+    Generate values varying randomly by up to ±20% around a base value.
+    
+    Numba keeps its own random state, so np.random.seed() in Python does
+    not make these values reproducible.
+    
+    Args:
+        base_value: Value to vary around
+        num_values: Number of values to generate
+    
+    Returns:
+        float64 array of non-negative values rounded to 2 decimals
+    """
+    return _get_kernel()(float(base_value), int(num_values))